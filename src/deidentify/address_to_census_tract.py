@@ -17,26 +17,41 @@ Examples:
 
 Requirements:
     shapely
+    numpy
     pandas
-    xlrd (pandas Excel compatibility)
+    orjson
+    python-calamine (pandas Excel compatibility)
     smartystreets_python_sdk
 """
 import os
-import json
+import sys
 import click
 import config
+import orjson
+import time
 import pickle
+import sqlite3
 import logging
+import shapely
+import numpy as np
 import pandas as pd
 from textwrap import dedent
-from cachetools import TTLCache
-from shapely.geometry import shape, Point
-from smartystreets_python_sdk import StaticCredentials, exceptions, ClientBuilder
+from functools import lru_cache
+from itertools import islice
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from shapely.geometry import shape
+from shapely.strtree import STRtree
+from smartystreets_python_sdk import StaticCredentials, exceptions, ClientBuilder, Batch
 from smartystreets_python_sdk.us_street import Lookup
 from smartystreets_python_sdk.us_extract import Lookup as ExtractLookup
 
 LOG = logging.getLogger(__name__)
 CACHE_TTL = 60 * 60 * 24 * 28  # 4 weeks
+MAX_CONCURRENT_REQUESTS = 10  # Concurrent requests to SmartyStreets
+JSON_CHUNK_SIZE = 1000  # Records geocoded together; enough for full batches
+TRACTS_CACHE_VERSION = 2  # Bump when the structure from load_geojson changes
+OUTPUT_BUFFER_SIZE = 1 << 20  # Bytes buffered before writing to output files
 
 @click.command()
 @click.argument('filename', metavar="<filename>", required=True,
@@ -85,6 +100,7 @@ def address_to_census_tract(filename, institute, output, invalidate_cache,
     address in a JSON file, please use a `.json` file extension in the given
     <output> option. Similarly, if providing address data in CSV or Excel
     format, please use a `.csv` file extension in the given <output> option.
+    JSON output, like JSON input, is newline-delimited: one record per line.
 
     To reduce the total number of requests sent to SmartyStreets' geocoding API,
     responses (including negative response) are cached. To override the cache
@@ -100,7 +116,12 @@ def address_to_census_tract_inner(filename, institute, output, invalidate_cache,
     """
     Raises a :class:`UnsupportedFileExtensionError` when a given *filename* is
     not supported.
+
+    Raises a :class:`MissingCredentialsError` before any data is processed if
+    the SmartyStreets credentials are not set.
     """
+    smartystreets_credentials()
+
     custom_address_config = not all(arg is None for arg in kwargs.values())
 
     if custom_address_config:
@@ -126,43 +147,69 @@ def address_to_census_tract_inner(filename, institute, output, invalidate_cache,
 def process_json(filepath: str, output: str, address_map: dict,
                  invalidate_cache: bool, keep_zipcode: bool):
     """
-    Given a *filepath* to a JSON file, processes the relevant keys containing
-    address data (from *address_map*) and generates an extra key for census
-    tract data. Raises a :class:`NoAddressDataFoundError` if the address mapping
-    is invalid and yields no matching keys from the address data.
+    Given a *filepath* to a newline-delimited JSON file, processes the relevant
+    keys containing address data (from *address_map*) and generates an extra
+    key for census tract data. Raises a :class:`NoAddressDataFoundError` if the
+    address mapping is invalid and yields no matching keys from the address
+    data.
 
     If a given address is invalid, `census_tract` is left blank.
 
     If *invalidate_cache* is true, any attempt at loading cached data is
     overridden.
 
-    Dumps the generated JSON data to stdout unless an *output* file path is
-    given.
+    Dumps the generated newline-delimited JSON data to stdout unless an
+    *output* file path is given.
 
     TODO keep_zipcode
 
-    To minimize costs, an address should only be looked up once (via
-    :func:`lookup_address`).
+    Records are read, geocoded and written out in chunks of
+    :const:`JSON_CHUNK_SIZE`, so memory use does not grow with the size of the
+    file. Each chunk of output is written at once. To minimize costs, an
+    address should only be looked up once (via
+    :func:`geocode_uncached_addresses`).
     """
-    with open(filepath, encoding = "UTF-8") as file:
-        data = [ json.loads(line) for line in file ]
-
     tracts = load_geojson("data/geojsons/Washington_2016.geojson")
     cache = load_or_create_cache()
 
-    to_save = []
-    for record in data:
-        result = process_json_record(record, address_map, tracts, cache,
-                                     invalidate_cache, keep_zipcode)
-        if output:
-            to_save.append(result)
-        else:
-            print(json.dumps(result, sort_keys=True))
+    with open(filepath, mode='rb') as file, \
+         (open(output, mode='wb', buffering=OUTPUT_BUFFER_SIZE) if output
+            else nullcontext(sys.stdout.buffer)) as out:
+
+        while True:
+            data = [ orjson.loads(line) for line in islice(file, JSON_CHUNK_SIZE) ]
+            if not data:
+                break
+
+            results = process_json_chunk(data, address_map, tracts, cache,
+                                         invalidate_cache, keep_zipcode)
+
+            out.write(b"".join(
+                orjson.dumps(result, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+                    for result in results))
 
     save_cache(cache)
 
-    if output:
-        json.dump(to_save, open(output, mode='w'))
+def process_json_chunk(data: list, address_map: dict, tracts: dict,
+                       cache: sqlite3.Connection, invalidate_cache: bool,
+                       keep_zipcode: bool) -> list:
+    """
+    Given a list of records (*data*) from a JSON file, geocodes all of their
+    addresses and finds their census tracts together, and returns the list of
+    results generated by :func:`process_json_record`, in the same order.
+    """
+    std_addresses = [
+        standardize_address(address_data_json_record(record, address_map), address_map)
+            for record in data
+    ]
+
+    responses = geocode_addresses(std_addresses, cache, invalidate_cache)
+    drop_keys = address_drop_keys(address_map, keep_zipcode)
+
+    return [
+        process_json_record(record, census_tract, drop_keys)
+            for record, census_tract in zip(data, census_tracts(responses, tracts))
+    ]
 
 def process_csv_or_excel(filepath: str, output: str, address_map: dict,
                          invalidate_cache: bool, keep_zipcode: bool):
@@ -179,7 +226,7 @@ def process_csv_or_excel(filepath: str, output: str, address_map: dict,
     Dumps the data to stdout unless an *output* file path is given.
 
     To minimize costs, an address should only be looked up once (via
-    `lookup_address()`).
+    :func:`geocode_uncached_addresses`).
 
     # TODO keep_zipcode
     """
@@ -187,60 +234,49 @@ def process_csv_or_excel(filepath: str, output: str, address_map: dict,
     tracts = load_geojson("data/geojsons/Washington_2016.geojson")
     cache = load_or_create_cache()
 
-    address = address_data_csv_or_excel(df, address_map)
-    address['std_address'] = address.apply(lambda x: standardize_address(x, address_map))
-
-    response = geocode_address_csv_or_excel(address, cache, invalidate_cache)
+    # Values are already standardized column-wise
+    std_addresses = [
+        map_address(address, address_map)
+            for address in address_data_csv_or_excel(df, address_map)
+    ]
 
-    response.apply(lambda x: save_to_cache(x['std_address'], x['response'], cache), axis=1)
+    responses = geocode_addresses(std_addresses, cache, invalidate_cache)
 
     # Drop identifiable address columns
-    drop_columns = list(address_map.values())
-
-    if keep_zipcode:
-        drop_columns.remove(address_map['zipcode'])
+    drop_columns = address_drop_keys(address_map, keep_zipcode)
 
-    df = df[[ col for col in list(df) if col not in drop_columns ]]
-    df['census_tract'] = census_tract_csv_or_excel(response, tracts)
+    df = df.drop(columns=list(drop_columns))
+    df['census_tract'] = census_tracts(responses, tracts)
 
     dump_csv_or_excel(df, output)
     save_cache(cache)
 
-def process_json_record(record: dict, address_map: dict, tracts,
-                        cache: TTLCache, invalidate_cache: bool,
-                        keep_zipcode: bool) -> dict:
+def address_drop_keys(address_map: dict, keep_zipcode: bool) -> set:
     """
-    Given a *record* dictionary representing a line from a JSON file of data,
-    processes the relevant keys containing address data (from *address_map*)
-    and generates an extra key for census tract data. Drops identifiable address
-    keys from the original data.
-
-    If a given address is invalid, `census_tract` is left blank.
+    Returns the set of identifiable address keys (from *address_map*) to drop
+    from the original data, keeping the zipcode key if *keep_zipcode* is true.
+    """
+    drop_keys = set(filter(None, address_map.values()))
 
-    If *invalidate_cache* is true, any attempt at loading cached data is
-    overridden.
+    if keep_zipcode:
+        drop_keys.discard(address_map['zipcode'])
 
-    Dumps the generated JSON data to stdout unless an *output* file path is
-    given.
+    return drop_keys
 
-    TODO keep_zipcode
+def process_json_record(record: dict, census_tract: str, drop_keys: set) -> dict:
     """
-    address = address_data_json_record(record, address_map)
-    LOG.info(f"Currently geocoding address {address}.")
+    Given a *record* dictionary representing a line from a JSON file of data
+    and the *census_tract* found for its address, generates an extra key for
+    census tract data. Drops identifiable address keys (*drop_keys*, from
+    :func:`address_drop_keys`) from the original data.
 
-    std_address = standardize_address(address, address_map)
-    response = None
-    if not invalidate_cache:
-        response = check_cache(std_address, cache)
-    response = geocode_uncached_address(response, std_address)
-    save_to_cache(std_address, response, cache)
+    If a given address is invalid, `census_tract` is left blank.
 
+    TODO keep_zipcode
+    """
     # Drop identifiable address keys and add census tract
-    drop_keys = list(address_map.values())
-    keep_zipcode and drop_keys.remove(address_map['zipcode'])
-
-    result = {k: record[k] for k in record if k not in drop_keys}
-    result["census_tract"] = census_tract_json_record(response, tracts)
+    result = {k: v for k, v in record.items() if k not in drop_keys}
+    result["census_tract"] = census_tract
     return result
 
 def address_data_json_record(record: dict, address_map: dict) -> dict:
@@ -263,33 +299,31 @@ def address_data_json_record(record: dict, address_map: dict) -> dict:
 
     return address
 
-def census_tract_json_record(response: dict, tracts) -> str:
-    """
-    Extract lat/lng from *response* object and return the affiliated census
-    tract from the given *tracts* file of polygons
-    """
-    if not response or not (response['lat'] or response['lng']):
-        LOG.warning("Failed to geocode address.")
-        return
-
-    latlng = [response['lat'], response['lng']]
-
-    return latlng_to_polygon(latlng, tracts)
-
 def load_csv_or_excel(filename: str) -> pd.DataFrame:
     """
     Given a *filename* to a CSV or XLS/XLSX file, returns it as a DataFrame.
+
+    All values are read as strings, with empty cells left as empty strings
+    rather than NaN, so that values like zipcodes keep their leading zeros and
+    are passed through unchanged.
+
+    Excel files are read with the calamine engine, which handles both XLS and
+    XLSX and is much faster than xlrd or openpyxl.
     """
     if filename.endswith('.csv'):
-        df = pd.read_csv(filename)
+        df = pd.read_csv(filename, dtype=str, na_filter=False)
     else:
-        df = pd.read_excel(filename)
+        df = pd.read_excel(filename, engine='calamine', dtype=str, na_filter=False)
     return df
 
-def address_data_csv_or_excel(df: pd.DataFrame, address_map: dict) -> pd.Series:
+def address_data_csv_or_excel(df: pd.DataFrame, address_map: dict) -> list:
     """
     Given a pandas DataFrame *df*, subset to address-relevant columns
-    noted by the *address_map* and return these data separately.
+    noted by the *address_map* and return these data separately, as a list of
+    one dict per row.
+
+    Values are standardized as in :func:`standardize_address`, but a whole
+    column at a time.
 
     Raises a :class:`NoAddressDataFoundError` if no columns resulted from
     mapping the given data *df* to the API.
@@ -306,148 +340,296 @@ def address_data_csv_or_excel(df: pd.DataFrame, address_map: dict) -> pd.Series:
     except KeyError:
         raise AddressTranslationError(list(df), address_map)
 
-    return pd.Series(address_data.to_dict(orient='records'))
+    address_data = address_data.apply(
+        lambda column: column.astype(str).str.upper().str.split().str.join(" "))
 
-def geocode_address_csv_or_excel(address: pd.DataFrame, cache: TTLCache,
-                                 invalidate_cache: bool) -> pd.DataFrame:
+    return address_data.to_dict(orient='records')
+
+def geocode_addresses(std_addresses: list, cache: sqlite3.Connection,
+                      invalidate_cache: bool) -> list:
     """
-    # Check in cache first
-    # Look up those not in cache
+    Given a list of *std_addresses*, returns the list of their geocoding
+    responses, in the same order.
+
+    Responses are looked up in the *cache* first, unless *invalidate_cache* is
+    true. Addresses not found in the cache are geocoded by
+    :func:`geocode_uncached_addresses`, and only their new responses are saved
+    to the *cache* and committed, so that other runs are not locked out of the
+    *cache* for longer than a single write.
     """
-    response = pd.DataFrame()
-    response['response'] = None
-    response['std_address'] = address['std_address']
+    keys = [ cache_key(std_address) for std_address in std_addresses ]
 
+    responses = [ None ] * len(std_addresses)
     if not invalidate_cache:
-        response['response'] = response['std_address'].apply(lambda x: check_cache(x, cache))
+        responses = [ check_cache(key, cache) for key in keys ]
+
+    uncached = [ i for i, response in enumerate(responses) if type(response) != dict ]
+
+    responses = geocode_uncached_addresses(responses, std_addresses, keys)
 
-    response['response'] = response.apply(lambda x:
-        geocode_uncached_address(x['response'], x['std_address']), axis=1)
+    geocoded = { keys[i]: responses[i] for i in uncached }
+    save_to_cache(list(geocoded.keys()), list(geocoded.values()), cache)
+    cache.commit()
 
-    return response
+    return responses
 
-def geocode_uncached_address(response: dict, std_address: dict) -> dict:
+def geocode_uncached_addresses(responses: list, std_addresses: list,
+                               keys: list) -> list:
     """
-    Given a an empty *response* that did not come from the cache for a given
-    *std_address*, looks it up the *std_address* using the SmartyStreets US
-    address API. If after this initial lookup, the API response is still empty,
-    the address was considered invalid. A second attempt is then made to lookup
-    the address using the SmartyStreets extract address API. The response,
-    whether still empty or not, is returned at the end.
+    Given a list of *responses* that came from the cache (or None where they
+    did not) for the corresponding list of *std_addresses* and their cache
+    *keys*, returns the list of *responses* with every uncached address
+    geocoded.
+
+    Uncached addresses are looked up using the SmartyStreets US Street API in
+    batches of up to :attr:`Batch.MAX_BATCH_SIZE` addresses per request. If the
+    US Street API response for an address is empty, the address was considered
+    invalid, and a second attempt is made to look it up using the SmartyStreets
+    US Extract API. At most :const:`MAX_CONCURRENT_REQUESTS` requests are in
+    flight at once. Responses which are still empty are returned as such.
+
+    Identical addresses (those with the same key) are only looked up once.
     """
-    if type(response) == dict:  # Was stored in cache
-        return response
+    responses = list(responses)
+
+    duplicates = {}
+    for i, response in enumerate(responses):
+        if type(response) != dict:
+            duplicates.setdefault(keys[i], []).append(i)
+
+    uncached = [ indices[0] for indices in duplicates.values() ]
+    batches = [ uncached[i:i + Batch.MAX_BATCH_SIZE]
+        for i in range(0, len(uncached), Batch.MAX_BATCH_SIZE) ]
 
-    response = lookup_address(std_address)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+        results = executor.map(lambda batch:
+            lookup_addresses([ std_addresses[i] for i in batch ]), batches)
 
-    if not response:
-        LOG.info(f"No match found. Extracting address from text.")
-        response = extract_address(std_address)
+        for batch, result in zip(batches, results):
+            for i, response in zip(batch, result):
+                responses[i] = response
 
-    if not response:
-       LOG.warning(f"Could not look up address.")
+        unmatched = [ i for i in uncached if not responses[i] ]
+        if unmatched:
+            LOG.info(f"No match found for {len(unmatched)} addresses. Extracting addresses from text.")
 
-    return response
+        results = executor.map(extract_address, [ std_addresses[i] for i in unmatched ])
 
-def census_tract_csv_or_excel(response: pd.DataFrame, tracts) -> pd.Series:
+        for i, response in zip(unmatched, results):
+            responses[i] = response
+
+            if not response:
+                LOG.warning(f"Could not look up address.")
+
+    for first, *rest in duplicates.values():
+        for i in rest:
+            responses[i] = responses[first]
+
+    return responses
+
+def census_tracts(responses: list, tracts) -> np.ndarray:
     """
-    Extract lat/lng from *response* DataFrame and return a pd.Series containing
+    Extract lat/lng from the list of *responses* and return an array containing
     the affiliated census tract from the given *tracts* file of polygons.
+
+    All points are tested against the spatial index in *tracts* at once, so
+    there is no per-address Python overhead. Candidate tracts from the index are
+    then checked with the prepared tract shapes. A point within more than one
+    tract gets the first of them in GeoJSON order.
     """
-    lat = response['response'].apply(lambda x: x.get('lat', None))
-    lng = response['response'].apply(lambda x: x.get('lng', None))
-    latlng = pd.Series(list(zip(lat, lng)))
-    return latlng.apply(lambda x: latlng_to_polygon(x, tracts))
+    lat = np.array([ (response or {}).get('lat') for response in responses ], dtype=float)
+    lng = np.array([ (response or {}).get('lng') for response in responses ], dtype=float)
+
+    # Addresses which failed to geocode have no point to look up
+    geocoded = np.flatnonzero(~(np.isnan(lat) | np.isnan(lng)))
+
+    # Ye olde lat/lng vs. lng/lat schism rears its head.
+    points = shapely.points(lng[geocoded], lat[geocoded])
+    tree = tracts["tree"]
+
+    point_index, tract_index = tree.query(points)
+    point_index = geocoded[point_index]
+    contained = shapely.contains_xy(tree.geometries[tract_index],
+        lng[point_index], lat[point_index])
+    point_index, tract_index = point_index[contained], tract_index[contained]
+
+    # Keep only the first containing tract (in GeoJSON order) for each point
+    order = np.lexsort((tract_index, point_index))
+    point_index, first = np.unique(point_index[order], return_index=True)
+    tract_index = tract_index[order][first]
+
+    census_tract = np.full(len(responses), None, dtype=object)
+    census_tract[point_index] = tracts["geoids"][tract_index]
+
+    if len(geocoded) < len(responses):
+        LOG.warning(f"Failed to geocode {len(responses) - len(geocoded)} addresses.")
+
+    unmatched = len(geocoded) - len(point_index)
+    if unmatched:
+        LOG.warning(f"Failed to find tract for {unmatched} addresses.")
+
+    return census_tract
 
 def dump_csv_or_excel(df: pd.DataFrame, output: str):
     """
     Given a DataFrame *df*, prints it to a given *output* filename. If *output*
     is empty, prints *df* to stdout.
+
+    The output file is written through a buffer of :const:`OUTPUT_BUFFER_SIZE`
+    bytes. Output to stdout is streamed rather than built up as one string.
     """
     if output:
-        df.to_csv(output, index=False)
+        with open(output, mode='w', encoding='utf-8', newline='',
+                  buffering=OUTPUT_BUFFER_SIZE) as file:
+            df.to_csv(file, index=False)
     else:
-        print(df.to_csv(index=False))
+        df.to_csv(sys.stdout, index=False)
+
+@lru_cache(maxsize=1)
+def smartystreets_credentials() -> StaticCredentials:
+    """
+    Returns SmartyStreets credentials read once from the environment variables
+    ``SMARTYSTREETS_AUTH_ID`` and ``SMARTYSTREETS_AUTH_TOKEN``.
+
+    Raises a :class:`MissingCredentialsError` if either is not set.
+    """
+    try:
+        auth_id = os.environ['SMARTYSTREETS_AUTH_ID']
+        auth_token = os.environ['SMARTYSTREETS_AUTH_TOKEN']
+    except KeyError as e:
+        raise MissingCredentialsError(e.args[0])
+
+    return StaticCredentials(auth_id, auth_token)
 
 def smartystreets_client_builder():
     """
-    Returns a new :class:`smartystreets_python_sdk.ClientBuilder` using
-    credentials from the environment variables ``SMARTYSTREETS_AUTH_ID`` and
-    ``SMARTYSTREETS_AUTH_TOKEN``.
+    Returns a new :class:`smartystreets_python_sdk.ClientBuilder` using the
+    credentials from :func:`smartystreets_credentials`.
+    """
+    return ClientBuilder(smartystreets_credentials())
+
+@lru_cache(maxsize=1)
+def us_street_client():
+    """
+    Returns the SmartyStreets US Street API client shared by all lookups,
+    building it on first use so that its HTTP connections are reused.
     """
-    auth_id = os.environ['SMARTYSTREETS_AUTH_ID']
-    auth_token = os.environ['SMARTYSTREETS_AUTH_TOKEN']
+    return smartystreets_client_builder().build_us_street_api_client()
 
-    return ClientBuilder(StaticCredentials(auth_id, auth_token))
+@lru_cache(maxsize=1)
+def us_extract_client():
+    """
+    Returns the SmartyStreets US Extract API client shared by all lookups,
+    building it on first use so that its HTTP connections are reused.
+    """
+    return smartystreets_client_builder().build_us_extract_api_client()
 
-def load_or_create_cache() -> TTLCache:
+def load_or_create_cache() -> sqlite3.Connection:
     """
-    Tries to load a pickled cache from the filepath `cache.pickle`. If a cache
-    is not found at this location, creates a new one. Returns the cache.
+    Opens the SQLite cache database at the filepath `cache.sqlite`, creating it
+    if it does not exist. Returns the connection to the cache.
+
+    Entries are read and written individually, so the cache never has to be
+    loaded or rewritten as a whole. Expired entries are deleted when the cache
+    is opened, so the database does not grow without bound.
     """
-    try:
-        cache = pickle.load(open('cache.pickle', mode='rb'))
-    except FileNotFoundError:
-        LOG.warning("Couldn't find an existing cache file. Creating new cache.")
-        cache = TTLCache(maxsize=100000, ttl=CACHE_TTL)
+    cache = sqlite3.connect('cache.sqlite')
+    cache.execute("""
+        create table if not exists cache (
+            key text primary key,
+            value text not null,
+            expires_at real not null)
+        """)
+    cache.execute("delete from cache where expires_at <= ?", (time.time(),))
+    cache.commit()
     return cache
 
-def check_cache(address: dict, cache: TTLCache) -> dict:
+def cache_key(standardized_address: dict) -> str:
     """
-    Given an *address* and a *cache*, checks if the *cache* exists. If it does,
-    returns the given value of the *address* key in the *cache*. Returns nothing
-    if the *address* key does not exist in the *cache*.
+    Returns the key under which the response for a *standardized_address* is
+    stored in the cache: its JSON serialization, with keys sorted.
     """
-    if cache:
-        try:
-            return cache[json.dumps(address, sort_keys=True)]
-        except KeyError:
-            LOG.warning("Item not found in cache.")
-            pass
-    else:
-        LOG.warning("Cache does not exist or is empty.")
+    return orjson.dumps(standardized_address, option=orjson.OPT_SORT_KEYS).decode()
 
-def save_to_cache(standardized_address: dict, response: dict, cache: TTLCache):
+def check_cache(key: str, cache: sqlite3.Connection) -> dict:
     """
-    Given a *standardized_address* and its related *response* from the
-    SmartyStreets API, stores them as a key-value pair in the given *cache*,
-    overwriting the value for the existing *standardized_address* key if it
-    already existed in the *cache*.
+    Given an address *key* (from :func:`cache_key`) and a *cache*, returns the
+    unexpired value of the *key* in the *cache*. Returns nothing if the *key*
+    does not exist in the *cache* or has expired.
     """
-    cache[json.dumps(standardized_address, sort_keys=True)] = response
+    row = cache.execute(
+        "select value from cache where key = ? and expires_at > ?",
+        (key, time.time())).fetchone()
 
-def save_cache(cache: TTLCache):
-    """ Given a *cache*, saves it to a hard-coded file `cache.pickle`. """
-    pickle.dump(cache, open('cache.pickle', mode='wb'))
+    if row is None:
+        LOG.warning("Item not found in cache.")
+        return
+
+    return orjson.loads(row[0])
+
+def save_to_cache(keys: list, responses: list, cache: sqlite3.Connection):
+    """
+    Given a list of address *keys* (from :func:`cache_key`) and their related
+    *responses* from the SmartyStreets API, stores them as key-value pairs in
+    the given *cache* with a single statement, overwriting the values for
+    existing *keys* if they already existed in the *cache*. The entries expire
+    after :const:`CACHE_TTL` seconds.
+    """
+    expires_at = time.time() + CACHE_TTL
+
+    cache.executemany("insert or replace into cache values (?, ?, ?)",
+        ((key, orjson.dumps(response).decode(), expires_at)
+            for key, response in zip(keys, responses)))
 
-def lookup_address(address: dict) -> dict:
+def save_cache(cache: sqlite3.Connection):
+    """ Given a *cache*, commits its new entries and closes it. """
+    cache.commit()
+    cache.close()
+
+def lookup_addresses(addresses: list) -> list:
     """
-    Given an *address* matching the SmartyStreets API, returns a dict containing
-    a standardized address and lat/long coordinates from SmartyStreet's US
-    Street geocoding API.
+    Given a list of at most :attr:`Batch.MAX_BATCH_SIZE` *addresses* matching
+    the SmartyStreets API, looks them all up with a single request to
+    SmartyStreet's US Street geocoding API. Returns a list of responses in the
+    same order as *addresses*, each a dict containing lat/long coordinates.
 
     Note that this functionality works regardless of whether a given address is
     broken into pieces (street, city, zipcode, etc.) or is a free text lookup
     (and only the `street` parameter is used).
+
+    Addresses without a street are not sent and have a response of None.
     """
     LOG.info("""Pinging SmartyStreets geocoding API""")
-    client = smartystreets_client_builder().build_us_street_api_client()
-    result = None
+    client = us_street_client()
 
-    lookup = us_street_lookup(address)
+    lookups = [ us_street_lookup(address) for address in addresses ]
+    batch = Batch()
+
+    for address, lookup in zip(addresses, lookups):
+        if not lookup.street:
+            LOG.warning(dedent(f"""
+            No given street address for {address}.
+            Currently lookups are only possible with a street address."""))
+            continue
+
+        batch.add(lookup)
+
+    client.send_batch(batch)
+
+    return [ lookup_result_data(lookup) for lookup in lookups ]
+
+def lookup_result_data(lookup: Lookup) -> dict:
+    """
+    Given a US Street API *lookup* which has been sent, returns its response as
+    described in :func:`lookup_addresses`, or None if it was never sent.
+    """
     if not lookup.street:
-        LOG.warning(dedent(f"""
-        No given street address for {address}.
-        Currently lookups are only possible with a street address."""))
         return
 
-    client.send_lookup(lookup)
-    result = lookup.result
-
-    if not result:
+    if not lookup.result:
         return {}
 
-    return first_candidate_data(result)
+    return first_candidate_data(lookup.result)
 
 def us_street_lookup(address: dict) -> Lookup:
     """
@@ -478,12 +660,25 @@ def standardize_address(address: dict, api_map: dict) -> dict:
     *address* keys are mapped to the SmartyStreets API using the given
     *api_map*.
 
+    Values are upper-cased and runs of whitespace are collapsed, so that
+    trivially different spellings of an address share a cache entry.
+
     Raises a KeyError if a mapped key from *api_map* does not exist in
     *address*.
     """
     for key in address:
-        address[key] = str(address[key]).upper().strip()
+        address[key] = " ".join(str(address[key]).upper().split())
+
+    return map_address(address, api_map)
+
+def map_address(address: dict, api_map: dict) -> dict:
+    """
+    Returns the already standardized *address* with its keys mapped to the
+    SmartyStreets API using the given *api_map*.
 
+    Raises a KeyError if a mapped key from *api_map* does not exist in
+    *address*.
+    """
     standardized_address = {}
     for key in api_map:
         if key:
@@ -511,7 +706,7 @@ def extract_address(address: dict):
     """
     LOG.warning("Previous lookup failed. Looking up address as free text.")
 
-    client = smartystreets_client_builder().build_us_extract_api_client()
+    client = us_extract_client()
     address_text = ', '.join([ str(val) for val in list(address.values()) if val ])
 
     lookup = ExtractLookup()
@@ -539,35 +734,77 @@ def first_candidate_data(result) -> dict:
         #'plus4_code': first_candidate.components.plus4_code
     }
 
-def latlng_to_polygon(latlng: list, polygons):
+@lru_cache(maxsize=4)
+def load_geojson(geojson_filename) -> dict:
+    """
+    Read GeoJSON file and return a dict containing a spatial index (an
+    :class:`shapely.strtree.STRtree`) of its features converted to shapes
+    and an array of the features' GEOIDs in the same order as the index.
+
+    The shapes are prepared (see :func:`shapely.prepare`) so that repeated
+    containment tests against them are fast. Repeated calls for the same
+    *geojson_filename* within a process return the same tracts.
     """
-    Find the first polygon in *polygons* (loaded from file) which contains the
-    *latlng* and return the polygon GEOID (the nationally-unique census tract
-    identifier), else None.
+    tracts = read_cached_geojson(geojson_filename)
+    shapely.prepare(tracts["tree"].geometries)
+    return tracts
+
+def read_cached_geojson(geojson_filename) -> dict:
     """
-    # Ye olde lat/lng vs. lng/lat schism rears its head.
-    lat, lng = latlng
+    Returns the result of :func:`read_geojson` for the given
+    *geojson_filename*.
 
-    point = Point(lng, lat)
+    The result is pickled next to the GeoJSON file (as `*.pickle`) and reused
+    by later runs for as long as the GeoJSON file's modification time and size
+    (and :const:`TRACTS_CACHE_VERSION` and the installed shapely and numpy
+    versions) are unchanged. Prepared geometries are not preserved by pickling.
+    A pickle that can't be loaded for any reason is rebuilt.
+    """
+    cache_filename = geojson_filename + ".pickle"
+    stat = os.stat(geojson_filename)
+    source = (TRACTS_CACHE_VERSION, shapely.__version__, np.__version__,
+              stat.st_mtime_ns, stat.st_size)
 
-    for polygon in polygons:
-        if polygon["shape"].contains(point):
-            return polygon.get("properties", {}).get("GEOID")
+    try:
+        with open(cache_filename, mode='rb') as file:
+            cached = pickle.load(file)
 
-    LOG.warning(f"Failed to find tract for {latlng}.")
-    return None
+        if cached["source"] == source:
+            return cached["tracts"]
 
-def load_geojson(geojson_filename):
-    """Read GeoJSON file and return a list of features converted to shapes."""
+        LOG.info(f"Ignoring outdated tracts cache «{cache_filename}».")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Pickles from other library versions fail in many different ways
+        LOG.warning(f"Ignoring unreadable tracts cache «{cache_filename}»: {e!r}")
 
-    with open(geojson_filename) as file:
-        geojson = json.load(file)
+    tracts = read_geojson(geojson_filename)
 
-    return [
-        { "properties": feature["properties"], "shape": shape(feature['geometry']) }
-            for feature in geojson["features"]
-    ]
+    try:
+        with open(cache_filename, mode='wb') as file:
+            pickle.dump({ "source": source, "tracts": tracts }, file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        LOG.warning(f"Couldn't save tracts cache «{cache_filename}»: {e}")
+
+    return tracts
+
+def read_geojson(geojson_filename) -> dict:
+    """
+    Parse GeoJSON file into the (unprepared) dict of tracts described by
+    :func:`load_geojson`.
+    """
+    with open(geojson_filename, mode='rb') as file:
+        features = orjson.loads(file.read())["features"]
+
+    shapes = [ shape(feature['geometry']) for feature in features ]
 
+    return {
+        "tree": STRtree(shapes, node_capacity=10),
+        "geoids": np.array([ feature["properties"].get("GEOID") for feature in features ],
+                           dtype=object),
+    }
 
 class UnsupportedFileExtensionError(ValueError):
     """
@@ -577,6 +814,22 @@ class UnsupportedFileExtensionError(ValueError):
     pass
 
 
+class MissingCredentialsError(KeyError):
+    """
+    Raised by :func:`smartystreets_credentials` when the environment variable
+    *variable* holding SmartyStreets credentials is not set.
+    """
+    def __init__(self, variable):
+        self.variable = variable
+
+    def __str__(self):
+        return dedent(f"""
+        The environment variable {self.variable} is not set.
+        Please export your SmartyStreets credentials as described in the README
+        and try again.
+        """)
+
+
 class InvalidAddressMappingError(KeyError):
     """
     Raised by :func:`us_street_lookup` when a an *address_key* used in the
@@ -3,7 +3,6 @@
 
 """
 import os
-import re
 import json
 import click
 import config
@@ -38,45 +37,46 @@ def pii_deidentifier_inner(filepath, institute, **kwargs):
         pass
         #raise NoPIIDataFoundError(df.columns(), pii_map)
     pii_data = df[pii_columns]
-    pii = pd.Series(pii_data.to_dict(orient='records'))
-    print(pii)
+    print(pii_data)
 
-    pii['std_pii'] = pii.apply(lambda x: standardize_pii(x, pii_map))
-    pii['individual'] = pii['std_pii'].apply(generate_hash)
-    print(pii.individual.head())
+    secret = os.environ['PARTICIPANT_DEIDENTIFIER_SECRET'].encode('utf-8')
 
-def generate_hash(pii: dict):
+    std_pii = standardize_pii(pii_data, pii_map)
+    pii_strings = std_pii.iloc[:, 0].str.cat(std_pii.iloc[:, 1:], sep=' ')
+
+    individual = pd.Series([ generate_hash(x, secret) for x in pii_strings ])
+    print(individual.head())
+
+def generate_hash(pii_string: str, secret: bytes):
     """
-    TODO
+    Returns the hex SHA-256 digest of a *pii_string* (the standardized PII
+    values joined by spaces) followed by the *secret* (read once by the
+    caller).
     """
-    pii_string = ' '.join(pii.values())
+    return hashlib.sha256(pii_string.encode('utf-8') + secret).hexdigest()
 
-    secret = os.environ['PARTICIPANT_DEIDENTIFIER_SECRET']
-    new_hash = hashlib.sha256()
-    new_hash.update(pii_string.encode('utf-8'))
-    new_hash.update(secret.encode('utf-8'))
-    return new_hash.hexdigest()
 
-
-def standardize_pii(pii: dict, api_map: dict) -> dict:
+def standardize_pii(pii: pd.DataFrame, api_map: dict) -> pd.DataFrame:
     """
-    TODO the bottom part can be done in a loop
+    Returns a DataFrame of the standardized *pii* columns, named by and in the
+    order of *api_map*. Values are upper-cased and stripped a whole column at a
+    time. Keys of *api_map* without a mapped column are left out.
+
     Raises a KeyError if a mapped key from *api_map* does not exist in
     *pii*.
     """
-    if not set(pii.keys()).issubset(api_map.values()):
-        #raise PIITranslationNotFoundError(pii.keys(), api_map)
+    if not set(pii.columns).issubset(api_map.values()):
+        #raise PIITranslationNotFoundError(pii.columns, api_map)
         pass
-    for key in pii:
-        pii[key] = str(pii[key]).upper().strip()
-
-    # TODO
-    return {
-        'name': api_map['name'] and re.sub('[^a-zA-Z]+', '', pii[api_map['name']]),  # careful not to apply this to gender (when binary) or zipcode
-        'birth-date': api_map['birth-date'] and pii[api_map['birth-date']],
-        'gender': api_map['gender'] and pii[api_map['gender']],
-        'postal-code': api_map['postal-code'] and pii[api_map['postal-code']],
-    }
+    pii = pii.apply(lambda column: column.map(str).str.upper().str.strip())
+
+    std_pii = pd.DataFrame({ key: pii[api_map[key]] for key in api_map if api_map[key] })
+
+    # careful not to apply this to gender (when binary) or zipcode
+    if 'name' in std_pii:
+        std_pii['name'] = std_pii['name'].str.replace('[^a-zA-Z]+', '', regex=True)
+
+    return std_pii
 
 
 if __name__ == '__main__':